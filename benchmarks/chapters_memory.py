@@ -0,0 +1,63 @@
+"""
+Memory used by the chapters data, as dicts (before) and as Chapter (after).
+
+Usage:
+    python benchmarks/chapters_memory.py [NB_CHAPTERS] [NB_IMAGES]
+"""
+
+import os
+import sys
+import tracemalloc
+
+# The package is in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mangaread_dl.chapter import Chapter
+from mangaread_dl.utils import format_size
+
+
+def make_urls(i: int, nb_images: int) -> list:
+    """
+    This function will build the urls of the images of a chapter, as on mangaread.org.
+    """
+    return [
+        "https://www.mangaread.org/wp-content/uploads/WP-manga/data/"
+        "manga_5e9b0c6a4a3a1/{:032x}/{}.jpg".format(i * 7919, j + 1)
+        for j in range(nb_images)
+    ]
+
+
+def measure(build) -> int:
+    """
+    This function will measure the memory allocated by build().
+
+    Returns:
+        int: Allocated bytes.
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    data = build()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del data
+    return size
+
+
+if __name__ == "__main__":
+    nb_chapters = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    nb_images = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    # The urls are built in both cases, as when loading "data.json"
+    before = measure(lambda: [
+        {"name": "Chapter {:04d}".format(i + 1), "images": make_urls(i, nb_images)}
+        for i in range(nb_chapters)
+    ])
+    after = measure(lambda: [
+        Chapter("Chapter {:04d}".format(i + 1), make_urls(i, nb_images))
+        for i in range(nb_chapters)
+    ])
+
+    print("> {} chapters of {} images".format(nb_chapters, nb_images))
+    print("> dict:    {}".format(format_size(before)))
+    print("> Chapter: {}".format(format_size(after)))
+    print("> {:.1f}x less memory".format(before / after))
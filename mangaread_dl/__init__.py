@@ -0,0 +1,49 @@
+"""
+Download manga from "https://www.mangaread.org/".
+
+Usage:
+    from mangaread_dl import Mangaread
+
+    manga = Mangaread("https://www.mangaread.org/manga/one-piece")
+    manga.sync()
+    manga.package("cbz")
+    print(manga.status())
+
+The classes are imported when first used, so importing the package is fast.
+"""
+
+import importlib
+
+# Version of mangaread_dl package
+__version__ = "1.1.0"
+
+# Public names and their module
+_exports = {
+    "Mangaread": "mangaread",
+    "Chapter": "chapter",
+    "parse_chapter": "chapter",
+    "parse_chapter_list": "chapter",
+    "Progress": "progress",
+    "Profiler": "profiler",
+    "WorkQueue": "workqueue",
+    "SQLiteWorkQueue": "workqueue",
+    "Worker": "workqueue",
+    "Watcher": "watch",
+    "send_command": "watch",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str) -> any:
+    if name in _exports:
+        module = importlib.import_module("." + _exports[name], __name__)
+        value = getattr(module, name)
+        # Cache it, so __getattr__ is called once per name
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,7 @@
+"""
+Run the command line interface: python -m mangaread_dl
+"""
+
+from .cli import main
+
+main()
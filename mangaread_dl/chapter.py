@@ -0,0 +1,191 @@
+"""
+Chapters data and parsing of the chapter pages.
+"""
+
+import os
+import re
+import sys
+from array import array
+from html.parser import HTMLParser
+
+
+class Chapter:
+    """
+    Name, url and size of the images of a chapter, stored compactly.
+
+    The urls of a chapter share a prefix, stored once, and their suffixes
+    are joined in a single string. The full urls are only built when
+    'images' is read, i.e. while the chapter is processed.
+    """
+    __slots__ = ("name", "prefix", "suffixes", "nb_images", "sizes")
+
+    def __init__(self, name: str, images: list, sizes: list = None) -> None:
+        """
+        Args:
+            name (str): Name of the chapter.
+            images (list): Urls of the images.
+            sizes (list, optional): Size of the images in bytes, 0 if unknown.
+            Empty if not probed. Defaults to None.
+        """
+        self.name = name
+        self.images = images
+        self.sizes = array("q", sizes or [])
+
+    @property
+    def images(self) -> list:
+        """
+        Urls of the images.
+        """
+        if self.nb_images == 0:
+            return []
+        return [self.prefix + suffix for suffix in self.suffixes.split("\n")]
+
+    @images.setter
+    def images(self, images: list) -> None:
+        # Prefix up to the last "/", interned so identical prefixes are shared
+        prefix = os.path.commonprefix(images) if images else ""
+        prefix = prefix[:prefix.rfind("/") + 1]
+        self.prefix = sys.intern(prefix)
+        # Urls can't contain "\n", see parse_chapter
+        self.suffixes = "\n".join(url[len(prefix):] for url in images)
+        self.nb_images = len(images)
+
+    def to_dict(self) -> dict:
+        """
+        This function will convert the chapter to a dict, as saved in "data.json".
+
+        Returns:
+            dict: Chapter infos - {"name": str, "images": list, "sizes": list}
+        """
+        data = {
+            "name": self.name,
+            "images": self.images
+        }
+        if self.sizes:
+            data["sizes"] = self.sizes.tolist()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Chapter":
+        """
+        This function will create a chapter from a dict, as saved in "data.json".
+
+        Args:
+            data (dict): Chapter infos - {"name": str, "images": list, "sizes": list}
+
+        Returns:
+            Chapter: The chapter.
+        """
+        return cls(data["name"], data["images"], data.get("sizes"))
+
+    def __repr__(self) -> str:
+        return "Chapter(name={!r}, nb_images={})".format(self.name, self.nb_images)
+
+
+def parse_chapter(html: str, i: int) -> Chapter:
+    """
+    This function will get the name and the url of the images of a chapter.
+
+    Args:
+        html (str): Html of the chapter page.
+        i (int): Position of the chapter, starting at 0.
+
+    Returns:
+        Chapter: The chapter.
+    """
+    # Imported here, it's slow to import and not needed to check for new chapters
+    import bs4
+
+    # Parsing the html
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    # Getting the images
+    # div.reading-content img
+    images = soup.select("div.reading-content img")
+
+    # Get chapter name
+    chapter_name = soup.select_one("h1#chapter-heading").text.split(" - ")[-1]
+
+    # Remove special characters
+    chapter_name = re.sub(r"[^a-zA-Z0-9 ]", "", chapter_name)
+
+    # Get the index after "Chapter DIGITS"
+    index = 0
+    if chapter_name.startswith("Chapter "):
+        index = re.search(r"Chapter \d+", chapter_name).end()
+    # Get the chapter number and force number to 4 digits
+    chapter_number = i + 1
+    chapter_number = str(chapter_number).zfill(4)
+    # Set the chapter name
+    if chapter_name[index+1:].strip() == "":
+        chapter_name = f"Chapter {chapter_number}"
+    else:
+        chapter_name = f"Chapter {chapter_number} - {chapter_name[index:].strip()}"
+
+    url_images = []
+    # Getting the url of the images
+    for image in images:
+        # Replace all "\n" and "\t", spaces with ""
+        url = re.sub(r"[\n\t ]", "", image["data-src"])
+        # url in is the 'data-src' attribute
+        url_images.append(url)
+
+    return Chapter(chapter_name, url_images)
+
+
+class _ChapterListParser(HTMLParser):
+    """
+    Parser getting the links "ul.main > li > a" of a manga page.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        # Open tags - (tag, classes)
+        self.stack = []
+        # Url of the chapters
+        self.urls = []
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        attrs = dict(attrs)
+        # "</li>" is optional, a "<li>" closes the previous one of the list
+        if tag == "li":
+            for i in range(len(self.stack) - 1, -1, -1):
+                if self.stack[i][0] in ("ul", "ol"):
+                    break
+                if self.stack[i][0] == "li":
+                    del self.stack[i:]
+                    break
+        if tag == "a" and len(self.stack) >= 2 and self.stack[-1][0] == "li" \
+                and self.stack[-2][0] == "ul" and "main" in self.stack[-2][1] and attrs.get("href"):
+            self.urls.append(attrs["href"])
+        # Void elements have no end tag
+        if tag not in ("br", "img", "input", "link", "meta", "hr", "source", "wbr"):
+            self.stack.append((tag, (attrs.get("class") or "").split()))
+
+    def handle_endtag(self, tag: str) -> None:
+        # Close up to the matching tag, ignore stray end tags
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                break
+
+
+def parse_chapter_list(html: str) -> list:
+    """
+    This function will get the url of the chapters from the manga page.
+
+    It doesn't import bs4, so checking for new chapters stays fast. It
+    gives the same links as bs4 on closed "<li>" tags, as on mangaread.org,
+    but not always on malformed html: a "<li>" closes the previous one here
+    as in browsers, while bs4 with "html.parser" nests them. E.g. on
+    '<ul class=main><li><a href=a2>2</a><li><a href=a1>1</a></ul>' this
+    returns ['a2', 'a1'] and bs4 ['a2'].
+
+    Args:
+        html (str): Html of the manga page.
+
+    Returns:
+        list: Url of the chapters, newest first as on the page.
+    """
+    parser = _ChapterListParser()
+    parser.feed(html)
+    parser.close()
+    return parser.urls
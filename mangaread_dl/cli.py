@@ -0,0 +1,160 @@
+"""
+Command line interface.
+"""
+
+import argparse
+import os
+import sys
+
+
+def main(argv: list = None) -> None:
+    """
+    This function will run the command line interface.
+
+    Only argparse is imported before parsing the arguments, and the
+    modules to download are imported when needed, so "--help" and
+    "--status" start fast.
+
+    Args:
+        argv (list, optional): Arguments. Defaults to sys.argv[1:].
+    """
+    # Create the parser
+    parser = argparse.ArgumentParser(description="Download manga from mangadex")
+    # Add the arguments
+    parser.add_argument("-u", "--url", type=str, help="Url of the manga")
+    parser.add_argument("-mn", "--manga-name", type=str, help="Friendly name of the manga.", default=None)
+    parser.add_argument("-f", "--force", action="store_true", help="Force download")
+    parser.add_argument("-t", "--threads", type=int, help="Number of threads", default=15)
+    parser.add_argument("-c", "--convert", type=str, help="Convert the manga to: cbz, zip", default=None, choices=["cbz", "zip"])
+    parser.add_argument("-cof", "--convert-one-file", action="store_true", help="Convert the manga to one file")
+    parser.add_argument("-d", "--debug", action="store_true", help="Debug mode")
+    parser.add_argument("-s", "--status", action="store_true", help="Print the state of the manga, from the saved data, and exit")
+    parser.add_argument("-b", "--batch", action="store_true", help="Never ask the user, e.g. when run by a scheduler")
+    parser.add_argument("-p", "--probe", action="store_true", help="Probe the size of the images before downloading them")
+    parser.add_argument("-q", "--queue", type=str, help="Path of a work queue shared with workers (SQLite file)", default=None)
+    parser.add_argument("-w", "--worker", action="store_true", help="Run a worker for the queue given with --queue")
+    parser.add_argument("--visibility-timeout", type=float, help="Seconds before a task of a stopped worker is run again", default=60)
+    parser.add_argument("--idle-timeout", type=float, help="Seconds without task before a worker stops", default=60)
+    parser.add_argument("--profile", type=str, nargs="?", const=os.path.join("mangaread-dl", "profile"), default=None,
+                        help="Profile the stages, output in the given directory (default: mangaread-dl/profile)")
+    parser.add_argument("-W", "--watch", action="store_true", help="Keep the manga added with --control add up to date, until stopped")
+    parser.add_argument("--control", type=str, choices=["add", "remove", "status", "stop"], default=None,
+                        help="Send a command to the running --watch: add or remove the manga given with -u, status, stop")
+    parser.add_argument("--interval", type=float, help="Seconds between two polls of the manga, with --control add, at least 60", default=3600)
+    # Parse the arguments
+    args = parser.parse_args(argv)
+
+    # Run the watcher
+    if args.watch:
+        from .watch import Watcher
+        watcher = Watcher(nb_threads=args.threads, probe=args.probe, debug=args.debug)
+        try:
+            watcher.run()
+        except RuntimeError as e:
+            print("> {}".format(e))
+            sys.exit(1)
+        return
+
+    # Send a command to the watcher
+    if args.control != None:
+        import json
+        from .watch import MIN_INTERVAL, send_command
+        command = {"command": args.control}
+        if args.control in ("add", "remove"):
+            if args.url == None:
+                parser.error("--control {} requires --url".format(args.control))
+            command["url"] = args.url
+        if args.control == "add":
+            if args.interval < MIN_INTERVAL:
+                parser.error("--interval must be at least {} seconds".format(MIN_INTERVAL))
+            command.update({
+                "name": args.manga_name,
+                "interval": args.interval,
+                "convert": args.convert,
+                "one_file": args.convert_one_file
+            })
+        socket_path = os.path.join(os.getcwd(), "mangaread-dl", "watch.sock")
+        try:
+            result = send_command(socket_path, command)
+        except OSError:
+            print("> No watcher running in {}".format(os.path.dirname(socket_path)))
+            sys.exit(1)
+        except RuntimeError as e:
+            print("> {}".format(e))
+            sys.exit(1)
+        print(json.dumps(result, indent=4))
+        return
+
+    # Work queue shared with workers
+    work_queue = None
+    if args.queue != None:
+        from .workqueue import SQLiteWorkQueue
+        work_queue = SQLiteWorkQueue(args.queue)
+
+    # Run a worker
+    if args.worker:
+        if work_queue == None:
+            parser.error("--worker requires --queue")
+        from .workqueue import Worker
+        worker = Worker(
+            work_queue,
+            nb_threads=args.threads,
+            visibility_timeout=args.visibility_timeout,
+            idle_timeout=args.idle_timeout,
+            debug=args.debug
+        )
+        worker.run()
+        return
+
+    # If the url is not given
+    url = None
+    name = None
+    convert = None
+    if args.url == None:
+        if args.batch or args.status:
+            parser.error("--url is required with --batch or --status")
+        # Ask the user
+        while True:
+            url = input("Url of the manga: ")
+            if url != "":
+                break
+        name = input("Name of the manga (optional): ")
+        while True:
+            convert = input("Convert to cbz or zip (optional): ")
+            if convert == "" or convert == "cbz" or convert == "zip":
+                break
+    else:
+        url = args.url
+        name = args.manga_name
+        convert = args.convert
+
+    from .mangaread import Mangaread
+
+    # Create the manga object
+    manga = Mangaread(url_manga=url, name=name, nb_threads=args.threads, debug=args.debug, probe=args.probe,
+                      work_queue=work_queue, profile_path=args.profile)
+    # Print the state of the manga
+    if args.status:
+        status = manga.status()
+        print("> {}".format(status["name"]))
+        print("> {} chapters scraped, {} chapters downloaded, {} images".format(
+            status["chapters_scraped"], status["chapters_downloaded"], status["images"]
+        ))
+        print("> Output directory : {}".format(status["path"]))
+        return
+    # Download the manga
+    success = manga.download(args.force, interactive=not args.batch)
+    # Convert the manga
+    if success:
+        # Keep the folders in batch mode
+        manga.convert(convert, args.convert_one_file, False if args.batch else None)
+        manga.print_output_dir()
+    # Print the profile
+    if manga.profiler != None:
+        manga.profiler.report()
+
+    # Wait for a key press
+    if not args.batch:
+        input("\nPress any key to exit...")
+    if not success:
+        sys.exit(1)
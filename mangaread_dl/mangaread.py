@@ -0,0 +1,1205 @@
+"""
+Download manga from "https://www.mangaread.org/".
+"""
+
+import contextlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
+
+from .chapter import Chapter, parse_chapter, parse_chapter_list
+from .progress import Progress
+from .utils import format_size, make_session
+
+if TYPE_CHECKING:
+    from .workqueue import WorkQueue
+
+# Logs already removed, a log is removed once per process, not on every download
+_removed_logs = set()
+
+
+class Mangaread:
+    """
+    A manga of mangaread.org, downloaded in "<output_dir>/<manga name>/".
+
+    Creating it has no side effect: the folders are created, and the saved
+    data is loaded, when first needed.
+    """
+    def __init__(self, url_manga: str, name: str = None, nb_threads: int = 15, debug: bool = False, probe: bool = False,
+                 work_queue: "WorkQueue" = None, profile_path: str = None, output_dir: str = None,
+                 progress_callback: callable = None, quiet: bool = False) -> None:
+        """
+        Args:
+            url_manga (str): Url of the manga.
+            name (str, optional): Friendly name of the manga. Defaults to the name in the url.
+            nb_threads (int, optional): Number of threads. Defaults to 15.
+            debug (bool, optional): Debug mode. Defaults to False.
+            probe (bool, optional): Probe the size of the images before downloading them. Defaults to False.
+            work_queue (WorkQueue, optional): Queue shared with workers. Defaults to None.
+            profile_path (str, optional): Directory of the profile, None to not profile. Defaults to None.
+            output_dir (str, optional): Output directory. Defaults to "mangaread-dl" in the current directory.
+            progress_callback (callable, optional): Called as callback(stage, done, total)
+            while scraping ("get_images"), probing ("probe_sizes") and downloading
+            ("download_images"), also when the workers of a work queue do it. The
+            progress line is then not written. Defaults to None.
+            quiet (bool, optional): If True, nothing is written on stdout, e.g. when
+            used by a service. Defaults to False.
+        """
+        # Debug mode
+        self.debug = debug
+        # Probe the size of the images before downloading them
+        self.probe = probe
+        # Queue shared with workers, None to download in this process
+        self.work_queue = work_queue
+        # Profiler of the stages, None if not profiling
+        self.profiler = None
+        if profile_path != None:
+            from .profiler import Profiler
+            self.profiler = Profiler(profile_path)
+        # Called with the progress of the stages
+        self.progress_callback = progress_callback
+        # Write nothing on stdout
+        self.quiet = quiet
+        # Url of the manga
+        self.url_manga = url_manga
+        # Number of threads
+        self.nb_threads = nb_threads
+        # Manga name
+        if name != None:
+            self.manga_name = name
+        elif self.url_manga.endswith("/"):
+            self.manga_name = self.url_manga.split("/")[-2]
+            # Camel case
+            self.manga_name = " ".join([word.capitalize() for word in self.manga_name.split("-")])
+        else:
+            self.manga_name = self.url_manga.split("/")[-1]
+            # Camel case
+            self.manga_name = " ".join([word.capitalize() for word in self.manga_name.split("-")])
+        # Output directory
+        self.output_path = output_dir if output_dir != None else os.path.join(os.getcwd(), "mangaread-dl")
+        # Manga path
+        self.manga_path = os.path.join(self.output_path, self.manga_name)
+        # Chapter path
+        self.chapter_path = "Chapter {}/"
+        # Image path
+        self.image_path = "{} - {}.{}"
+        # Url of the chapters
+        self.url_chapters = []
+        # Chapters data - Images urls and chapter names, list of Chapter
+        self.chapters = []
+        # Current chapter scraped
+        self.currentChapterScrapped = 0
+        # Current chapter downloaded
+        self.currentChapterDownloaded = 0
+        # Number of urls probed by each task of the probe queue
+        self.probe_batch_size = 20
+        # Seconds to wait for a server while probing, shorter as no image is downloaded
+        self.probe_timeout = 10
+        # Seconds to wait for a server, so a stalled request doesn't block a thread forever
+        self.timeout = 60
+        # Seconds without progress of the workers before giving up waiting for them
+        self.queue_stall_timeout = 300
+        # Session shared by the threads, created when first used
+        self._session = None
+        # Validators of the last manga page, to not parse it again if unchanged
+        self._manga_page = {"etag": None, "last_modified": None, "hash": None}
+        # Log file
+        self.log_path = os.path.join(self.output_path, "mangaread-dl.log")
+        # True once the saved data is loaded
+        self._loaded = False
+
+    @property
+    def session(self):
+        """
+        Session shared by the threads, to reuse connections between requests and runs.
+        """
+        if self._session is None:
+            self._session = make_session(self.nb_threads)
+        return self._session
+
+    def _prepare(self) -> None:
+        """
+        This function will create the manga folder and remove the log, before downloading.
+        """
+        # Creating the manga folder
+        if not os.path.exists(self.manga_path):
+            os.makedirs(self.manga_path)
+
+        # Remove 'mangaread-dl.log'
+        if self.log_path not in _removed_logs:
+            _removed_logs.add(self.log_path)
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+
+        # Loading saved data
+        self._ensure_loaded()
+
+    def _ensure_loaded(self) -> None:
+        """
+        This function will load the saved data, once.
+        """
+        if not self._loaded:
+            self._loaded = True
+            self._load_data()
+
+    def print_debug(self, *args, **kwargs) -> None:
+        """
+        This function will print the arguments, and write them in the log, if debug is True.
+        """
+        if self.debug:
+            if not self.quiet:
+                print("[DEBUG]", *args, **kwargs)
+
+            # Get current time
+            now = datetime.now()
+            # Format the time "YYYY-MM-DD HH:MM:SS"
+            now = now.strftime("%Y-%m-%d %H:%M:%S")
+            # Append to log file
+            os.makedirs(self.output_path, exist_ok=True)
+            with open(self.log_path, "a") as f:
+                f.write(f"[{now}] {' '.join([str(arg) for arg in args])}\n")
+
+    def print_info(self, *args, **kwargs) -> None:
+        """
+        This function will print the arguments if quiet is False.
+        """
+        if not self.quiet:
+            print(*args, **kwargs)
+
+    def _stage(self, name: str):
+        """
+        This function will profile a stage if profiling, used as 'with self._stage(name):'.
+
+        Args:
+            name (str): Name of the stage.
+        """
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(name)
+
+    def _task(self, func: callable) -> callable:
+        """
+        This function will wrap a task of a ModernQueue if profiling.
+
+        Args:
+            func (callable): The task.
+
+        Returns:
+            callable: The task, wrapped if profiling.
+        """
+        if self.profiler is None:
+            return func
+        return self.profiler.wrap_task(func)
+
+    def _load_data(self) -> None:
+        """
+        This function will load saved data of the manga if any.
+
+        We are currently in "/manga/manga_name/".
+        A file named "data.json" is created in the manga folder.
+        """
+        # Path of the data file
+        data_path = os.path.join(self.manga_path, "data.json")
+        # If the data file exists
+        if os.path.exists(data_path):
+            self.print_debug("! Data file found")
+            # Open the data file
+            with open(data_path, "r") as f:
+                # Read the data file
+                data = f.read()
+            # Convert the data to a dict
+            data = json.loads(data)
+            # Set the current chapter
+            self.currentChapterScrapped = data["currentChapterScrapped"]
+            self.currentChapterDownloaded = data["currentChapterDownloaded"]
+            # Set the chapters
+            self.chapters = [Chapter.from_dict(chapter) for chapter in data["chapters"]]
+            self.print_debug("Data loaded:")
+            self.print_debug(f"- currentChapterScrapped: {self.currentChapterScrapped}")
+            self.print_debug(f"- currentChapterDownloaded: {self.currentChapterDownloaded}")
+            self.print_debug(f"- chapters: {self.chapters}")
+
+    def _save_data(self) -> None:
+        """
+        This function will save the data of the manga.
+        """
+        # Path of the data file
+        data_path = os.path.join(self.manga_path, "data.json")
+        # Data to save
+        data = {
+            "currentChapterScrapped": self.currentChapterScrapped,
+            "currentChapterDownloaded": self.currentChapterDownloaded,
+            "chapters": [chapter.to_dict() for chapter in self.chapters]
+        }
+        # Open the data file
+        with open(data_path, "w") as f:
+            # Write the data
+            f.write(json.dumps(data, indent=4))
+        # Print a message
+        self.print_info("> Data saved")
+
+    def _get_chapters(self) -> None:
+        """
+        This function will get the url of the chapters.
+        """
+        # Getting the html of the manga, if changed since the last time
+        headers = {}
+        if self.url_chapters:
+            if self._manga_page["etag"] != None:
+                headers["If-None-Match"] = self._manga_page["etag"]
+            if self._manga_page["last_modified"] != None:
+                headers["If-Modified-Since"] = self._manga_page["last_modified"]
+        html = self.session.get(self.url_manga, headers=headers, timeout=self.timeout)
+        # An error page, e.g. 503, has no chapter
+        html.raise_for_status()
+        if html.status_code == 304 or (self.url_chapters and hash(html.text) == self._manga_page["hash"]):
+            self.print_debug("Manga page unchanged")
+            return
+        self._manga_page = {
+            "etag": html.headers.get("ETag"),
+            "last_modified": html.headers.get("Last-Modified"),
+            "hash": hash(html.text)
+        }
+        # Getting the chapters
+        # ul.main > li > a
+        chapters = parse_chapter_list(html.text)
+        # Reverse the chapters
+        chapters.reverse()
+        self.print_debug("Chapters found:")
+        self.print_debug(f"- {chapters}")
+        # Getting the url of the chapters
+        self.url_chapters = chapters
+
+    def _get_images(self) -> bool:
+        """
+        This function will get the url of the images.
+
+        Returns:
+            bool: True if scraping was successful, False otherwise.
+        """
+        from .threadqueue import ThreadQueue
+
+        # Number of chapters scraped by the queue
+        nb_scraped = 0
+        lock = threading.Lock()
+
+        def get_images_from_chapter(chapter: str, i, _self) -> dict:
+            nonlocal nb_scraped
+            # Getting the html of the chapter
+            html = _self.session.get(chapter, timeout=_self.timeout)
+            # Parsing the html
+            chapter_infos = parse_chapter(html.text, i)
+            chapter_name = chapter_infos.name
+            _self.print_debug(f"Images found for chapter {i+1}:")
+            _self.print_debug(f"- {chapter_infos.images}")
+            _self.print_debug(f"Chapter name: {chapter_name}")
+
+            # Count the chapter, the chapters are not scraped in order
+            with lock:
+                nb_scraped += 1
+                done = start + nb_scraped
+
+            # Print a message
+            self.print_info("> {} images found from '{}' - {}/{}".format(
+                chapter_infos.nb_images,
+                chapter_name,
+                done,
+                len(_self.url_chapters))
+            )
+            if _self.progress_callback != None:
+                _self.progress_callback("get_images", done, len(_self.url_chapters))
+
+            # Return the chapter infos
+            return chapter_infos
+        # If currentChapterScrapped is equal to the number of chapters and different from 0
+        if self.currentChapterScrapped == len(self.url_chapters) and self.currentChapterScrapped != 0:
+            # Return True
+            return True
+        is_finished = False
+        # First chapter to scrap
+        start = self.currentChapterScrapped
+        queue = ThreadQueue(max_threads=self.nb_threads)
+        try:
+            self.print_debug(f"Images scrapping from {self.currentChapterScrapped} to {len(self.url_chapters)}")
+            # Getting the images
+            for i in range(self.currentChapterScrapped, len(self.url_chapters)):
+                # Url of the chapter
+                chapter = self.url_chapters[i]
+                queue.add(
+                    func=self._task(get_images_from_chapter),
+                    args={
+                        "chapter": chapter,
+                        "i": i,
+                        "_self": self
+                    }
+                )
+            # Run the queue
+            queue.run()
+        except KeyboardInterrupt:
+            # Print a message
+            self.print_info("\n> Stopping...")
+        except Exception as e:
+            # Print a message
+            self.print_info("> An error occured: {}".format(e))
+        finally:
+            # Add the results to the chapters, up to the first missing one
+            # A failed task has no result, its index is the position from start
+            results = dict(queue.results)
+            del self.chapters[start:]
+            while self.currentChapterScrapped - start in results:
+                self.chapters.append(results[self.currentChapterScrapped - start])
+                self.currentChapterScrapped += 1
+            is_finished = self.currentChapterScrapped == len(self.url_chapters)
+            # Print a message
+            if is_finished:
+                self.print_info("> Scraping finished")
+            else:
+                self.print_info("> Found images from {} chapters".format(self.currentChapterScrapped))
+            # Save data
+            self._save_data()
+
+        return is_finished
+
+    def _probe_size(self, url_image: str) -> int:
+        """
+        This function will get the size of an image without downloading it.
+
+        A HEAD request is tried first, then a GET request on the first byte
+        for servers not giving the 'Content-Length' on HEAD.
+
+        Args:
+            url_image (str): Url of the image.
+
+        Returns:
+            int: Size of the image in bytes, 0 if unknown.
+        """
+        try:
+            response = self.session.head(url_image, allow_redirects=True, timeout=self.probe_timeout)
+            size = int(response.headers.get("Content-Length", 0))
+            if response.ok and size > 0:
+                return size
+        except Exception as e:
+            self.print_debug(f"HEAD failed for {url_image}: {e}")
+        try:
+            # 'Content-Range' is "bytes 0-0/SIZE"
+            response = self.session.get(url_image, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.probe_timeout)
+            response.close()
+            content_range = response.headers.get("Content-Range", "")
+            if "/" in content_range and content_range.split("/")[-1].isdigit():
+                return int(content_range.split("/")[-1])
+        except Exception as e:
+            self.print_debug(f"Probe failed for {url_image}: {e}")
+        return 0
+
+    def _probe_sizes(self) -> None:
+        """
+        This function will get the size of the images to download.
+
+        The sizes are saved in the chapters data under "sizes", so an image
+        is only probed once. The unknown sizes, 0, are probed again.
+        """
+        from .threadqueue import ThreadQueue
+
+        # Number of urls probed
+        nb_probed = 0
+        lock = threading.Lock()
+
+        def probe_batch(batch: list) -> None:
+            nonlocal nb_probed
+            # batch is a list of (chapter_pos, image_pos, url_image)
+            for chapter_pos, image_pos, url_image in batch:
+                size = self._probe_size(url_image)
+                # Keep 0 if the probe failed, to probe it again next time
+                if size > 0:
+                    self.chapters[chapter_pos].sizes[image_pos] = size
+            with lock:
+                nb_probed += len(batch)
+                done = nb_probed
+            if self.progress_callback != None:
+                self.progress_callback("probe_sizes", done, len(to_probe))
+
+        # Urls to probe
+        to_probe = []
+        for i in range(self.currentChapterDownloaded, self.currentChapterScrapped):
+            chapter = self.chapters[i]
+            # Already probed
+            if len(chapter.sizes) == chapter.nb_images and all(chapter.sizes):
+                continue
+            # Never probed, all sizes unknown
+            if len(chapter.sizes) != chapter.nb_images:
+                chapter.sizes = array("q", [0] * chapter.nb_images)
+            for j, url_image in enumerate(chapter.images):
+                if chapter.sizes[j] == 0:
+                    to_probe.append((i, j, url_image))
+        if not to_probe:
+            return
+        # Print a message
+        self.print_info("> Probing the size of {} images".format(len(to_probe)))
+        # One task per batch, so a thread probes several urls on the same connection
+        queue = ThreadQueue(max_threads=self.nb_threads)
+        for k in range(0, len(to_probe), self.probe_batch_size):
+            queue.add(self._task(probe_batch), (to_probe[k:k + self.probe_batch_size],))
+        try:
+            queue.run()
+        except KeyboardInterrupt:
+            self.print_info("\n> Stopping probe...")
+        finally:
+            # Print a message
+            total = sum(
+                sum(self.chapters[i].sizes)
+                for i in range(self.currentChapterDownloaded, self.currentChapterScrapped)
+            )
+            self.print_info("> {} to download".format(format_size(total)))
+            # Save data
+            self._save_data()
+
+    def _image_tasks(self, skip_existing: bool = True) -> list:
+        """
+        This function will list the images to download, and create the chapter folders.
+
+        The images are written through a temporary file, so an existing image
+        is complete. Skipping them, a run stopped before its end doesn't
+        download again the images of the chapters it didn't complete.
+
+        Args:
+            skip_existing (bool, optional): If True, skip the images already
+            downloaded. Defaults to True.
+
+        Returns:
+            list: Tasks - (size, (url_image, path, chapter_pos, image_pos)).
+            The size is 0 if unknown. Largest images first if probed.
+        """
+        # Tasks to add to the queue - (size, args)
+        tasks = []
+
+        for i in range(self.currentChapterDownloaded, self.currentChapterScrapped):
+            # Infos of the chapter
+            chapter = self.chapters[i]
+            # Name of the chapter, without special characters
+            chapter_name = chapter.name
+            # Url of the images
+            url_images = chapter.images
+            # Size of the images, 0 if unknown
+            sizes = chapter.sizes
+            if len(sizes) != len(url_images):
+                sizes = [0] * len(url_images)
+            # Path of the chapter
+            chapter_path = os.path.join(self.manga_path, chapter_name)
+            self.print_debug(f"Chapter path: {chapter_path}")
+            # Create the chapter folder
+            os.makedirs(chapter_path, exist_ok=True)
+            # Change chapter name to remove title
+            chapter_name = "Chapter " + chapter_name.split(" - ")[0]
+            # Add tasks to the queue
+            for j in range(len(url_images)):
+                # Url of the image
+                url_image = url_images[j]
+                # Path of the image
+                path = os.path.join(
+                    chapter_path,
+                    self.image_path.format(
+                        chapter_name,
+                        str(j).zfill(4),
+                        url_image.split(".")[-1]
+                    )
+                )
+                # Already downloaded
+                if skip_existing and os.path.exists(path) and os.path.getsize(path) > 0:
+                    continue
+                # Add the task
+                tasks.append((sizes[j], (url_image, path, i, j)))
+        # Largest images first, so the run does not end waiting on a big one
+        if self.probe:
+            tasks.sort(key=lambda task: task[0], reverse=True)
+        return tasks
+
+    def _download_images(self, skip_existing: bool = True) -> None:
+        """
+        This function will download the images.
+
+        Args:
+            skip_existing (bool, optional): If True, skip the images already
+            downloaded. Defaults to True.
+        """
+        from .threadqueue import ThreadQueue
+
+        def download_image(url_image: str, path: str, chapter_pos: int, image_pos: int) -> None:
+            """
+            This function will download an image.
+
+            Args:
+                url_image (str): Url of the image.
+                path (str): Path of the image.
+                chapter_pos (int): Position of the chapter.
+                image_pos (int): Position of the image.
+            """
+            # Download the image
+            image = self.session.get(url_image, timeout=self.timeout)
+            image.raise_for_status()
+            # Write the image to a temporary file, so an interrupted write
+            # doesn't leave a truncated image, seen as downloaded
+            with open(path + ".part", "wb") as f:
+                f.write(image.content)
+            os.replace(path + ".part", path)
+            # Update the progress
+            progress.update(len(image.content))
+
+        # Download images
+        tasks = self._image_tasks(skip_existing)
+        # Bytes to download, only known if every image was probed
+        nb_bytes = 0
+        if tasks and all(size > 0 for size, _ in tasks):
+            nb_bytes = sum(size for size, _ in tasks)
+        # The progress line is replaced by the callback
+        progress = Progress(len(tasks), nb_bytes, callback=self.progress_callback,
+                            quiet=self.quiet or self.progress_callback != None)
+
+        # Create a queue
+        queue = ThreadQueue(max_threads=self.nb_threads)
+        for _, args in tasks:
+            queue.add(self._task(download_image), args)
+        # Get chapter downloaded before running the queue
+        old_chapter_downloaded = self.currentChapterDownloaded
+        try:
+            self.print_debug("Running queue...")
+            progress.start()
+            # Run the queue
+            queue.run()
+        except:
+            pass
+        finally:
+            progress.stop()
+            self._check_images(old_chapter_downloaded)
+
+    def _check_images(self, old_chapter_downloaded: int) -> None:
+        """
+        This function will check the downloaded images and update currentChapterDownloaded.
+
+        Args:
+            old_chapter_downloaded (int): currentChapterDownloaded before the download.
+        """
+        self.print_info("\n> Starting checking images...")
+        self.print_debug(f"Checking images from chapter {old_chapter_downloaded} to {self.currentChapterScrapped}")
+        chapter_completed = 0
+        # For each image, Check if all images are downloaded using their size
+        # If the size is 0, the image is not downloaded
+        for i in range(self.currentChapterDownloaded, self.currentChapterScrapped):
+            # Infos of the chapter
+            chapter = self.chapters[i]
+            # Name of the chapter, without special characters
+            chapter_name = chapter.name
+            # Url of the images
+            url_images = chapter.images
+            # Path of the chapter
+            chapter_path = os.path.join(self.manga_path, chapter_name)
+            # Print a message
+            self.print_info("> Checking images from '{}' - {}/{}".format(
+                chapter_name,
+                chapter_completed + 1,
+                self.currentChapterScrapped - old_chapter_downloaded
+            ))
+            chapter_name = "Chapter " + chapter_name.split(" - ")[0]
+            nb_images_downloaded = 0
+            # Check if all images are downloaded
+            for j in range(len(url_images)):
+                # Path of the image
+                path = os.path.join(
+                    chapter_path,
+                    self.image_path.format(
+                        chapter_name,
+                        str(j).zfill(4),
+                        url_images[j].split(".")[-1]
+                    )
+                )
+                # If the size is 0, the image is not downloaded
+                if not os.path.exists(path) or os.path.getsize(path) == 0:
+                    # Print a message
+                    self.print_info("> Image {} not downloaded".format(path))
+                    # Remove the image
+                    if os.path.exists(path):
+                        os.remove(path)
+                    break
+                else:
+                    # Increment nb_images_downloaded
+                    nb_images_downloaded += 1
+            if nb_images_downloaded == len(url_images):
+                # Print a message
+                self.print_info("> All images downloaded")
+                # Increment chapter_completed
+                chapter_completed += 1
+            else:
+                break
+        # Set currentChapterDownloaded
+        self.currentChapterDownloaded = self.currentChapterDownloaded + chapter_completed
+        # Print a message
+        self.print_info("> Checking finished")
+        self.print_info("> {} chapters correctly downloaded".format(
+            self.currentChapterDownloaded - old_chapter_downloaded
+        ))
+        # Save data
+        self._save_data()
+
+    def _wait_for_queue(self, kind: str) -> bool:
+        """
+        This function will wait until the workers ran all the tasks of the manga.
+
+        It gives up if the tasks don't progress for 'queue_stall_timeout'
+        seconds, e.g. when no worker is running.
+
+        Args:
+            kind (str): Kind of the tasks: "chapter" or "image".
+
+        Returns:
+            bool: True if all the tasks were run, False if the workers stalled.
+        """
+        # Counts of the last change, and its time
+        last_counts = None
+        last_change = time.monotonic()
+        while True:
+            counts = self.work_queue.counts(self.manga_name, kind)
+            total = sum(counts.values())
+            if not self.quiet:
+                sys.stdout.write("\r> {}/{} {} tasks done - {} running - {} failed".format(
+                    counts["done"], total, kind, counts["leased"], counts["failed"]
+                ).ljust(79))
+                sys.stdout.flush()
+            if self.progress_callback != None:
+                stage = "get_images" if kind == "chapter" else "download_images"
+                self.progress_callback(stage, counts["done"], total)
+            if counts["pending"] == 0 and counts["leased"] == 0:
+                self.print_info()
+                return True
+            if counts != last_counts:
+                last_counts = counts
+                last_change = time.monotonic()
+            elif time.monotonic() - last_change > self.queue_stall_timeout:
+                self.print_info()
+                self.print_info("> No progress for {}s, is a worker running ?".format(self.queue_stall_timeout))
+                return False
+            time.sleep(2)
+
+    def _get_images_from_queue(self) -> bool:
+        """
+        This function will get the url of the images, scraped by the workers.
+
+        Returns:
+            bool: True if scraping was successful, False otherwise.
+        """
+        # If currentChapterScrapped is equal to the number of chapters and different from 0
+        if self.currentChapterScrapped == len(self.url_chapters) and self.currentChapterScrapped != 0:
+            return True
+        # Remove the tasks of a previous run
+        self.work_queue.clear(self.manga_name, "chapter")
+        self.work_queue.publish(self.manga_name, "chapter", [
+            (i, {"url": self.url_chapters[i], "position": i}, 0)
+            for i in range(self.currentChapterScrapped, len(self.url_chapters))
+        ])
+        # Print a message
+        self.print_info("> {} chapters published".format(len(self.url_chapters) - self.currentChapterScrapped))
+        try:
+            self._wait_for_queue("chapter")
+        except KeyboardInterrupt:
+            self.print_info("\n> Stopping...")
+        # Merge the chapters scraped, up to the first missing one
+        results = dict(self.work_queue.results(self.manga_name, "chapter"))
+        del self.chapters[self.currentChapterScrapped:]
+        while self.currentChapterScrapped in results:
+            self.chapters.append(Chapter.from_dict(results[self.currentChapterScrapped]))
+            self.currentChapterScrapped += 1
+        # Print a message
+        self.print_info("> Found images from {} chapters".format(self.currentChapterScrapped))
+        # Save data
+        self._save_data()
+        return self.currentChapterScrapped == len(self.url_chapters)
+
+    def _download_images_from_queue(self, skip_existing: bool = True) -> None:
+        """
+        This function will download the images by the workers.
+
+        Args:
+            skip_existing (bool, optional): If True, skip the images already
+            downloaded. Defaults to True.
+        """
+        # Get chapter downloaded before running the queue
+        old_chapter_downloaded = self.currentChapterDownloaded
+        # Remove the tasks of a previous run
+        self.work_queue.clear(self.manga_name, "image")
+        # The size is the priority, so the largest images are leased first
+        tasks = self._image_tasks(skip_existing)
+        self.work_queue.publish(self.manga_name, "image", [
+            (k, {"url": url_image, "path": os.path.relpath(path, self.output_path)}, size)
+            for k, (size, (url_image, path, _, _)) in enumerate(tasks)
+        ])
+        # Print a message
+        self.print_info("> {} images published".format(len(tasks)))
+        try:
+            self._wait_for_queue("image")
+        except KeyboardInterrupt:
+            self.print_info("\n> Stopping...")
+        finally:
+            self._check_images(old_chapter_downloaded)
+
+    def _delete_folders(self) -> None:
+        """
+        This function will delete the folders.
+        """
+        # For each chapter
+        for i in range(self.currentChapterDownloaded):
+            # Infos of the chapter
+            chapter = self.chapters[i]
+            # Name of the chapter, without special characters
+            chapter_name = re.sub(r"[^a-zA-Z0-9]+", " ", chapter.name)
+            # Get the index after "Chapter DIGITS"
+            index = 0
+            if chapter_name.startswith("Chapter "):
+                index = re.search(r"Chapter \d+", chapter_name).end()
+            # Get the chapter number and force number to 4 digits
+            chapter_number = i + 1
+            chapter_number = str(chapter_number).zfill(4)
+            # Set the chapter name
+            if chapter_name[index+1:].strip() == "":
+                chapter_name = f"Chapter {chapter_number}"
+            else:
+                chapter_name = f"Chapter {chapter_number} - {chapter_name[index:].strip()}"
+            # Path of the chapter
+            chapter_path = os.path.join(self.manga_path, chapter_name)
+            if not os.path.exists(chapter_path):
+                continue
+            # Print a message
+            self.print_info("> Deleting '{}'".format(chapter_name))
+            # Delete the folder
+            shutil.rmtree(chapter_path, ignore_errors=True)
+
+    def _convert_to_cbz(self, one_file: bool = False, first_chapter: int = 0) -> None:
+        """
+        This function will convert the images to cbz.
+
+        Args:
+            one_file (bool, optional): If True,
+            all chapters will be in one cbz. Defaults to False.
+            first_chapter (int, optional): Position of the first chapter to convert,
+            ignored with one_file as the file has all the chapters. Defaults to 0.
+        """
+        # If one_file is True
+        if one_file:
+            # Path of the cbz
+            cbz_path = os.path.join(
+                self.manga_path,
+                f"{self.manga_name}.cbz"
+            )
+            # Print a message
+            self.print_info("> Converting '{}'".format(self.manga_name))
+            # Create the cbz
+            with ZipFile(cbz_path, "w") as cbz:
+                # For each chapter
+                for i in range(self.currentChapterDownloaded):
+                    # Infos of the chapter
+                    chapter = self.chapters[i]
+                    # Name of the chapter, without special characters
+                    chapter_name = re.sub(r"[^a-zA-Z0-9]+", " ", chapter.name)
+                    # Get the index after "Chapter DIGITS"
+                    index = 0
+                    if chapter_name.startswith("Chapter "):
+                        index = re.search(r"Chapter \d+", chapter_name).end()
+                    # Get the chapter number and force number to 4 digits
+                    chapter_number = i + 1
+                    chapter_number = str(chapter_number).zfill(4)
+                    # Set the chapter name
+                    if chapter_name[index+1:].strip() == "":
+                        chapter_name = f"Chapter {chapter_number}"
+                    else:
+                        chapter_name = f"Chapter {chapter_number} - {chapter_name[index:].strip()}"
+                    # Path of the chapter
+                    chapter_path = os.path.join(self.manga_path, chapter_name)
+                    if not os.path.exists(chapter_path):
+                        continue
+                    # For each image
+                    for image in os.listdir(chapter_path):
+                        # continue if extension is cbz, zip, or part (image being written by a worker)
+                        if image.split(".")[-1] in ["cbz", "zip", "part"]:
+                            continue
+                        # Path of the image
+                        path = os.path.join(chapter_path, image)
+                        # Add the image to the cbz
+                        cbz.write(path, arcname=image)
+        else:
+            # For each chapter
+            for i in range(first_chapter, self.currentChapterDownloaded):
+                # Infos of the chapter
+                chapter = self.chapters[i]
+                # Name of the chapter, without special characters
+                chapter_name = re.sub(r"[^a-zA-Z0-9]+", " ", chapter.name)
+                # Get the index after "Chapter DIGITS"
+                index = 0
+                if chapter_name.startswith("Chapter "):
+                    index = re.search(r"Chapter \d+", chapter_name).end()
+                # Get the chapter number and force number to 4 digits
+                chapter_number = i + 1
+                chapter_number = str(chapter_number).zfill(4)
+                # Set the chapter name
+                if chapter_name[index+1:].strip() == "":
+                    chapter_name = f"Chapter {chapter_number}"
+                else:
+                    chapter_name = f"Chapter {chapter_number} - {chapter_name[index:].strip()}"
+                # Path of the chapter
+                chapter_path = os.path.join(self.manga_path, chapter_name)
+                if not os.path.exists(chapter_path):
+                    continue
+                # Path of the cbz
+                cbz_path = os.path.join(
+                    self.manga_path,
+                    f"{self.manga_name} - {chapter_name}.cbz"
+                )
+                # Print a message
+                self.print_info("> Converting '{}' - {}/{}".format(
+                    chapter_name,
+                    i + 1,
+                    self.currentChapterDownloaded
+                ))
+                # Create the cbz
+                with ZipFile(cbz_path, "w") as zip:
+                    for image in os.listdir(chapter_path):
+                        # continue if extension is cbz, zip, or part (image being written by a worker)
+                        if image.split(".")[-1] in ["cbz", "zip", "part"]:
+                            continue
+                        zip.write(
+                            os.path.join(chapter_path, image),
+                            arcname=image
+                        )
+
+    def _convert_to_zip(self, one_file: bool = False, first_chapter: int = 0) -> None:
+        """
+        This function will convert the images to zip.
+
+        Args:
+            one_file (bool, optional): If True,
+            all chapters will be in one zip. Defaults to False.
+            first_chapter (int, optional): Position of the first chapter to convert,
+            ignored with one_file as the file has all the chapters. Defaults to 0.
+        """
+        # If one_file is True
+        if one_file:
+            # Path of the zip
+            zip_path = os.path.join(
+                self.manga_path,
+                f"{self.manga_name}.zip"
+            )
+            # Print a message
+            self.print_info("> Converting '{}'".format(self.manga_name))
+            # Create the zip
+            with ZipFile(zip_path, "w") as zip:
+                # For each chapter
+                for i in range(self.currentChapterDownloaded):
+                    # Infos of the chapter
+                    chapter = self.chapters[i]
+                    # Name of the chapter, without special characters
+                    chapter_name = re.sub(r"[^a-zA-Z0-9]+", " ", chapter.name)
+                    # Get the index after "Chapter DIGITS"
+                    index = 0
+                    if chapter_name.startswith("Chapter "):
+                        index = re.search(r"Chapter \d+", chapter_name).end()
+                    # Get the chapter number and force number to 4 digits
+                    chapter_number = i + 1
+                    chapter_number = str(chapter_number).zfill(4)
+                    # Set the chapter name
+                    if chapter_name[index+1:].strip() == "":
+                        chapter_name = f"Chapter {chapter_number}"
+                    else:
+                        chapter_name = f"Chapter {chapter_number} - {chapter_name[index:].strip()}"
+                    # Path of the chapter
+                    chapter_path = os.path.join(self.manga_path, chapter_name)
+                    if not os.path.exists(chapter_path):
+                        continue
+                    # For each image
+                    for image in os.listdir(chapter_path):
+                        # continue if extension is cbz, zip, or part (image being written by a worker)
+                        if image.split(".")[-1] in ["cbz", "zip", "part"]:
+                            continue
+                        # Path of the image
+                        path = os.path.join(chapter_path, image)
+                        # Add the image to the zip
+                        zip.write(path, arcname=image)
+        else:
+            # For each chapter
+            for i in range(first_chapter, self.currentChapterDownloaded):
+                # Infos of the chapter
+                chapter = self.chapters[i]
+                # Name of the chapter, without special characters
+                chapter_name = re.sub(r"[^a-zA-Z0-9]+", " ", chapter.name)
+                # Get the index after "Chapter DIGITS"
+                index = 0
+                if chapter_name.startswith("Chapter "):
+                    index = re.search(r"Chapter \d+", chapter_name).end()
+                # Get the chapter number and force number to 4 digits
+                chapter_number = i + 1
+                chapter_number = str(chapter_number).zfill(4)
+                # Set the chapter name
+                if chapter_name[index+1:].strip() == "":
+                    chapter_name = f"Chapter {chapter_number}"
+                else:
+                    chapter_name = f"Chapter {chapter_number} - {chapter_name[index:].strip()}"
+                # Path of the chapter
+                chapter_path = os.path.join(self.manga_path, chapter_name)
+                if not os.path.exists(chapter_path):
+                    continue
+                # Path of the zip
+                zip_path = os.path.join(
+                    self.manga_path,
+                    f"{self.manga_name} - {chapter_name}.zip"
+                )
+                # Print a message
+                self.print_info("> Converting '{}' - {}/{}".format(
+                    chapter_name,
+                    i + 1,
+                    self.currentChapterDownloaded
+                ))
+                # Create the zip
+                with ZipFile(zip_path, "w") as zip:
+                    for image in os.listdir(chapter_path):
+                        # continue if extension is cbz, zip, or part (image being written by a worker)
+                        if image.split(".")[-1] in ["cbz", "zip", "part"]:
+                            continue
+                        zip.write(
+                            os.path.join(chapter_path, image),
+                            arcname=image
+                        )
+
+    def download(self, force: bool = False, interactive: bool = True) -> bool:
+        """
+        This function will download the manga.
+
+        Args:
+            force (bool): If True, the whole manga will be downloaded again.
+            interactive (bool, optional): If True, ask the user what to do
+            if scraping failed, else download the found chapters and return
+            False, as when chapters failed to download. Defaults to True.
+
+        Returns:
+            bool: True if the download is successful, False otherwise.
+        """
+        # Create the manga folder and load saved data
+        self._prepare()
+
+        # If force is True, we will download the whole manga again
+        if force:
+            # Print a message
+            self.print_info("> Force download")
+            # Set currentChapterDownloaded to 0
+            self.currentChapterDownloaded = 0
+            # Set currentChapterScrapped to 0
+            self.currentChapterScrapped = 0
+
+        self.print_debug("Getting chapters")
+        # Scrap the chapters
+        with self._stage("get_chapters"):
+            try:
+                self._get_chapters()
+            except Exception as e:
+                self.print_info("> Failed to get the chapters: {}".format(e))
+                return False
+        self.print_debug("Getting chapters done")
+
+        # If current downloaded chapters is equal to number of chapters scrapped
+        # We don't need to download the manga again
+        if self.currentChapterScrapped != 0 and self.currentChapterDownloaded == self.currentChapterScrapped \
+                and self.currentChapterScrapped >= len(self.url_chapters):
+            self.print_info("> Manga already downloaded")
+            self.print_info("There is no new chapter")
+            return True
+        
+        self.print_debug("Getting images")
+        # Scrap the images
+        with self._stage("get_images"):
+            if self.work_queue is not None:
+                is_successful = self._get_images_from_queue()
+            else:
+                is_successful = self._get_images()
+        self.print_debug("Getting images done")
+
+        # If the scrapping of the images is not successful
+        # Ask the user if he wants to try again or download found chapters
+        if not is_successful:
+            # Print a message
+            self.print_info("> Failed to scrap images")
+
+            # Download found chapters
+            ok = not interactive
+            while ok == False:
+                self.print_info("'y' to try again ; 'n' to download found chapters ; 'stop' to stop the program")
+                # Ask the user
+                answer = input("Do you want to try again ? (y/n/stop) ")
+                # If the answer is yes
+                if answer.lower() == "y":
+                    ok = True
+                    # Try again
+                    return self.download(force)
+                # If the answer is no
+                elif answer.lower() == "n":
+                    # Download found chapters
+                    ok = True
+                # If the answer is stop
+                elif answer.lower() == "stop":
+                    ok = True
+                    # Stop the program
+                    return False
+
+        # Probe the size of the images
+        if self.probe:
+            self.print_debug("Probing images")
+            with self._stage("probe_sizes"):
+                self._probe_sizes()
+            self.print_debug("Probing images done")
+
+        # Set currentChapterDownloaded
+        old_chapter_downloaded = self.currentChapterDownloaded
+
+        self.print_debug("Downloading images")
+        # Download the images
+        with self._stage("download_images"):
+            # Download again the existing images if forced
+            if self.work_queue is not None:
+                self._download_images_from_queue(not force)
+            else:
+                self._download_images(not force)
+        self.print_debug("Downloading images done")
+
+        # Print a message
+        self.print_info("> Download finished")
+        self.print_info("> {} new chapters downloaded".format(
+            self.currentChapterDownloaded - old_chapter_downloaded
+        ))
+
+        # Not successful if chapters are missing and the user wasn't asked
+        if interactive:
+            return True
+        return is_successful and self.currentChapterDownloaded == self.currentChapterScrapped
+
+    def convert(self, format: any, convert_one_file: bool = False, delete_folders: bool = None,
+                first_chapter: int = 0) -> None:
+        """
+        This function will convert the manga to the given format.
+
+        Args:
+            format (any): The format to convert the manga to.
+            convert_one_file (bool, optional): If True, all chapters will be in one file. Defaults to False.
+            delete_folders (bool, optional): If True, delete the image folders
+            after converting. If None, ask the user. Defaults to None.
+            first_chapter (int, optional): Position of the first chapter to convert,
+            to convert only the new chapters. Defaults to 0.
+        """
+        # If format is None, we don't need to convert the manga
+        if format == None:
+            return
+        # Load saved data
+        self._ensure_loaded()
+        # new line
+        self.print_info()
+        # Check if fomat is a string
+        if not isinstance(format, str):
+            # Print a message
+            self.print_info("> Format must be a string")
+            self.print_info("> Available formats : cbz, zip")
+            return
+        # Print a message
+        self.print_info("> Converting to {}".format(format))
+        # If format is cbz
+        if format == "cbz":
+            # Convert the manga to cbz
+            with self._stage("convert_to_cbz"):
+                self._convert_to_cbz(convert_one_file, first_chapter)
+        # If format is zip
+        elif format == "zip":
+            # Convert the manga to zip
+            with self._stage("convert_to_zip"):
+                self._convert_to_zip(convert_one_file, first_chapter)
+        else:
+            # Print a message
+            self.print_info("> Unknown format")
+            return
+        # Print a message
+        self.print_info("> Conversion finished")
+
+        if delete_folders != None:
+            if delete_folders:
+                self._delete_folders()
+            return
+
+        # Ask the user if he wants to delete the folders
+        ok = False
+        while ok == False:
+            self.print_info("'y' to delete folders ; 'n' to keep folders")
+            # Ask the user
+            answer = input("Do you want to delete the image folders ? (y/n) ")
+            # If the answer is yes
+            if answer.lower() == "y":
+                ok = True
+                # Delete the folders
+                self._delete_folders()
+            # If the answer is no
+            elif answer.lower() == "n":
+                ok = True
+            else:
+                self.print_info("> Unknown answer")
+
+    def sync(self, force: bool = False) -> bool:
+        """
+        This function will download the new chapters, without asking the user.
+
+        If scraping failed, the found chapters are still downloaded.
+
+        Args:
+            force (bool, optional): If True, the whole manga will be downloaded again. Defaults to False.
+
+        Returns:
+            bool: True if all the chapters are downloaded, False otherwise.
+        """
+        return self.download(force, interactive=False)
+
+    def package(self, format: str = "cbz", one_file: bool = False, delete_folders: bool = False,
+                first_chapter: int = 0) -> None:
+        """
+        This function will convert the downloaded chapters, without asking the user.
+
+        Args:
+            format (str, optional): "cbz" or "zip". Defaults to "cbz".
+            one_file (bool, optional): If True, all chapters will be in one file. Defaults to False.
+            delete_folders (bool, optional): If True, delete the image folders. Defaults to False.
+            first_chapter (int, optional): Position of the first chapter to convert,
+            to convert only the new chapters. Defaults to 0.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        if format not in ("cbz", "zip"):
+            raise ValueError("Unknown format: {}, available formats: cbz, zip".format(format))
+        self.convert(format, one_file, delete_folders, first_chapter)
+
+    def status(self) -> dict:
+        """
+        This function will get the state of the manga, from the saved data only.
+
+        Returns:
+            dict: {"name", "path", "chapters_scraped", "chapters_downloaded", "images"}
+        """
+        self._ensure_loaded()
+        return {
+            "name": self.manga_name,
+            "path": self.manga_path,
+            "chapters_scraped": self.currentChapterScrapped,
+            "chapters_downloaded": self.currentChapterDownloaded,
+            "images": sum(chapter.nb_images for chapter in self.chapters)
+        }
+
+    def print_output_dir(self):
+        """
+        This function will print the output directory.
+        """
+        self.print_info("> Output directory : {}".format(self.manga_path))
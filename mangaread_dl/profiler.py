@@ -0,0 +1,152 @@
+"""
+Profiling of the stages of a run.
+"""
+
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+from .utils import format_size
+
+
+class Profiler:
+    """
+    Profiler of the stages of a run: scraping, downloading, converting.
+
+    For each stage, it writes in 'path':
+        - "<stage>.prof": cProfile stats, to open with pstats, snakeviz or flameprof.
+        - "<stage>.txt": top functions, top memory allocations and time of the tasks.
+
+    The tasks run by ModernQueue are wrapped with 'wrap_task', to profile
+    their thread and measure their busy (CPU) and waiting (I/O) time, from
+    their start: the time queued for a free thread is not counted.
+    """
+    def __init__(self, path: str, top: int = 15) -> None:
+        """
+        Args:
+            path (str): Directory of the output files.
+            top (int, optional): Number of lines in the summaries. Defaults to 15.
+        """
+        self.path = path
+        self.top = top
+        # Profiles of the threads of the current stage
+        self.thread_profiles = []
+        # Times of the tasks of the current stage - (wall, cpu)
+        self.task_times = []
+        self.lock = threading.Lock()
+        # Summary of each stage - (stage, wall, cpu, peak memory, nb tasks, busy, waiting)
+        self.summaries = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """
+        This function will profile a stage, used as 'with profiler.stage(name):'.
+
+        Args:
+            name (str): Name of the stage, e.g. "download_images".
+        """
+        os.makedirs(self.path, exist_ok=True)
+        self.thread_profiles = []
+        self.task_times = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        snapshot_before = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        wall, cpu = time.perf_counter(), time.process_time()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot_after = tracemalloc.take_snapshot()
+            self._write(name, profile, wall, cpu, peak, snapshot_after.compare_to(snapshot_before, "lineno"))
+
+    def wrap_task(self, func: callable) -> callable:
+        """
+        This function will wrap a task run by ModernQueue.
+
+        Args:
+            func (callable): The task.
+
+        Returns:
+            callable: The wrapped task.
+        """
+        def wrapper(*args, **kwargs):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12+: the profile of the stage already sees all threads
+                profile = None
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+                if profile is not None:
+                    profile.disable()
+                with self.lock:
+                    self.task_times.append((wall, cpu))
+                    if profile is not None:
+                        self.thread_profiles.append(profile)
+        return wrapper
+
+    def _write(self, name: str, profile: cProfile.Profile, wall: float, cpu: float, peak: int, memory_diff: list) -> None:
+        """
+        This function will write the output files of a stage.
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        for thread_profile in self.thread_profiles:
+            stats.add(thread_profile)
+        stats.dump_stats(os.path.join(self.path, f"{name}.prof"))
+
+        # Time of the tasks
+        nb_tasks = len(self.task_times)
+        busy = sum(task_cpu for _, task_cpu in self.task_times)
+        waiting = sum(task_wall - task_cpu for task_wall, task_cpu in self.task_times)
+        stream.write(f"Stage '{name}': {wall:.2f}s wall, {cpu:.2f}s CPU, {format_size(peak)} peak memory\n")
+        if nb_tasks > 0:
+            stream.write(
+                f"{nb_tasks} tasks: {busy:.2f}s busy, {waiting:.2f}s waiting, "
+                f"{(busy + waiting) / max(wall, 1e-6):.1f} running on average\n"
+            )
+        # Top functions
+        stream.write("\nTop functions by cumulative time:\n")
+        stats.sort_stats("cumulative").print_stats(self.top)
+        stream.write("Top functions by own time:\n")
+        stats.sort_stats("tottime").print_stats(self.top)
+        # Top allocations
+        stream.write("Top memory allocations:\n")
+        for diff in memory_diff[:self.top]:
+            stream.write(f"{diff}\n")
+        with open(os.path.join(self.path, f"{name}.txt"), "w") as f:
+            f.write(stream.getvalue())
+
+        self.summaries.append((name, wall, cpu, peak, nb_tasks, busy, waiting))
+
+    def report(self) -> None:
+        """
+        This function will print the summary of the stages.
+        """
+        if not self.summaries:
+            return
+        print("\n> Profile - {}".format(self.path))
+        print("{:<18} {:>9} {:>9} {:>10} {:>6} {:>9} {:>9}".format(
+            "stage", "wall", "cpu", "peak mem", "tasks", "busy", "waiting"
+        ))
+        for name, wall, cpu, peak, nb_tasks, busy, waiting in self.summaries:
+            print("{:<18} {:>8.2f}s {:>8.2f}s {:>10} {:>6} {:>8.2f}s {:>8.2f}s".format(
+                name, wall, cpu, format_size(peak), nb_tasks, busy, waiting
+            ))
+        # Stop tracing the memory
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
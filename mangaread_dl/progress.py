@@ -0,0 +1,120 @@
+"""
+Progress of a download, rendered on a single line.
+"""
+
+import sys
+import threading
+import time
+
+from .utils import format_duration, format_size
+
+
+class Progress:
+    """
+    Progress of a download, rendered on a single line.
+
+    Workers only update the counters, under a lock. The line is rendered
+    by at most one worker every 'interval' seconds, so they don't contend
+    on stdout, and no render thread is needed.
+    """
+    def __init__(self, nb_images: int, nb_bytes: int = 0, interval: float = 0.5, callback: callable = None,
+                 quiet: bool = False) -> None:
+        """
+        Args:
+            nb_images (int): Number of images to download.
+            nb_bytes (int, optional): Expected number of bytes to download.
+            0 if unknown, the ETA is then based on the number of images. Defaults to 0.
+            interval (float, optional): Seconds between two renders. Defaults to 0.5.
+            callback (callable, optional): Called as callback("download_images", done, total)
+            at each render. Defaults to None.
+            quiet (bool, optional): If True, nothing is written on stdout, only
+            the callback is called. Defaults to False.
+        """
+        # Totals
+        self.nb_images = nb_images
+        self.nb_bytes = nb_bytes
+        # Counters
+        self.images_done = 0
+        self.bytes_done = 0
+        # Render interval
+        self.interval = interval
+        # Called at each render
+        self.callback = callback
+        # Write nothing on stdout
+        self.quiet = quiet
+        # Lock protecting the counters
+        self.lock = threading.Lock()
+        # Start time and time of the last render
+        self.start_time = time.monotonic()
+        self.last_render = 0
+
+    def update(self, nb_bytes: int) -> None:
+        """
+        This function will count one more downloaded image.
+
+        Args:
+            nb_bytes (int): Size of the downloaded image.
+        """
+        render = False
+        with self.lock:
+            self.images_done += 1
+            self.bytes_done += nb_bytes
+            images_done = self.images_done
+            now = time.monotonic()
+            if now - self.last_render >= self.interval:
+                self.last_render = now
+                render = True
+                if not self.quiet:
+                    line = self._render(now)
+        if render:
+            if not self.quiet:
+                sys.stdout.write("\r" + line.ljust(79))
+                sys.stdout.flush()
+            if self.callback != None:
+                self.callback("download_images", images_done, self.nb_images)
+
+    def _render(self, now: float) -> str:
+        """
+        This function will build the progress line, lock must be held.
+
+        Args:
+            now (float): Current time, from time.monotonic().
+
+        Returns:
+            str: The progress line.
+        """
+        elapsed = max(now - self.start_time, 1e-6)
+        line = "> {}/{} images".format(self.images_done, self.nb_images)
+        # Byte based progress if the sizes are known
+        if self.nb_bytes > 0:
+            line += " - {}/{}".format(format_size(self.bytes_done), format_size(self.nb_bytes))
+            done, total = self.bytes_done, self.nb_bytes
+        else:
+            line += " - {}".format(format_size(self.bytes_done))
+            done, total = self.images_done, self.nb_images
+        line += " - {}/s".format(format_size(self.bytes_done / elapsed))
+        # ETA
+        if done > 0:
+            remaining = max(total - done, 0) * elapsed / done
+            line += " - ETA {}".format(format_duration(remaining))
+        return line
+
+    def start(self) -> None:
+        """
+        This function will reset the start time, used for the speed and ETA.
+        """
+        with self.lock:
+            self.start_time = time.monotonic()
+
+    def stop(self) -> None:
+        """
+        This function will print the final progress.
+        """
+        with self.lock:
+            line = self._render(time.monotonic())
+            images_done = self.images_done
+        if not self.quiet:
+            sys.stdout.write("\r" + line.ljust(79) + "\n")
+            sys.stdout.flush()
+        if self.callback != None:
+            self.callback("download_images", images_done, self.nb_images)
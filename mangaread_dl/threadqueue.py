@@ -0,0 +1,67 @@
+"""
+ModernQueue usable while other threads are running.
+"""
+
+from threading import Thread
+from time import sleep
+
+from modernqueue import ModernQueue
+
+
+class ThreadQueue(ModernQueue):
+    """
+    ModernQueue counting only its own threads.
+
+    ModernQueue counts every thread of the process: run() refuses to start
+    while another thread is alive, e.g. the control socket of the watch
+    mode, and waits for the number of threads of the process to go under
+    max_threads, which never happens if other threads use the places.
+    """
+    def running(self) -> int:
+        """
+        Get the number of threads of the queue running.
+
+        Returns:
+        - (int) The number of threads running. 0 if the queue is finished.
+        """
+        return sum(1 for thread in self.threads if thread.is_alive())
+
+    def run(self, is_blocking: bool = True) -> None:
+        """
+        Run the queue, with at most max_threads threads of the queue at once.
+
+        Args:
+        - is_blocking (bool, optional): If True, the function will block until
+        the queue is finished. Default: True
+
+        Raises:
+        - RuntimeError: If the queue is already running.
+        - ValueError: If the queue is empty.
+        """
+        # Throw an error if running the queue while it's already running
+        if self.running() != 0:
+            raise RuntimeError("The queue is already running")
+        # Throw an error if the queue is empty
+        if not self.queue:
+            raise ValueError("The queue is empty")
+
+        # While there are still functions in the queue
+        while self.queue:
+            if self.max_threads != -1:
+                # Forget the finished threads, so running() stays cheap
+                self.threads = [thread for thread in self.threads if thread.is_alive()]
+                # If there are too many threads, wait
+                while self.running() >= self.max_threads:
+                    sleep(0.1)
+            # Get the next function in the queue
+            func, args = self.queue.pop(0)
+            # Run the function in a new thread
+            thread = Thread(target=func, args=args)
+            thread.start()
+            # Add the thread to the list of threads
+            self.threads.append(thread)
+
+        if is_blocking:
+            # If the function is blocking, wait for all threads to finish
+            for thread in self.threads:
+                thread.join()
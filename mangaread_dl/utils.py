@@ -0,0 +1,55 @@
+"""
+Helpers shared by the modules.
+"""
+
+
+def format_size(size: float) -> str:
+    """
+    This function will format a size in bytes to a human readable string.
+
+    Args:
+        size (float): Size in bytes.
+
+    Returns:
+        str: Human readable size, e.g. "12.3 MB".
+    """
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def format_duration(seconds: float) -> str:
+    """
+    This function will format a duration in seconds to "HH:MM:SS".
+
+    Args:
+        seconds (float): Duration in seconds.
+
+    Returns:
+        str: Formatted duration.
+    """
+    seconds = int(seconds)
+    return "{:02d}:{:02d}:{:02d}".format(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def make_session(pool_size: int):
+    """
+    This function will create a requests session keeping up to 'pool_size'
+    connections open, to be shared by threads.
+
+    Args:
+        pool_size (int): Number of connections kept open per host.
+
+    Returns:
+        requests.Session: The session.
+    """
+    # Imported here, it's slow to import
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
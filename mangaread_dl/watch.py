@@ -0,0 +1,380 @@
+"""
+Watch mode: a long-running process keeping ongoing manga up to date.
+"""
+
+import json
+import os
+import random
+import socket
+import socketserver
+import threading
+import time
+import traceback
+
+from .mangaread import Mangaread
+
+# Minimum seconds between two polls of a manga, not to hammer the site
+MIN_INTERVAL = 60
+
+
+class Series:
+    """
+    A manga followed by the watcher, and its schedule.
+    """
+    def __init__(self, url: str, name: str = None, interval: float = 3600, convert: str = None,
+                 one_file: bool = False) -> None:
+        """
+        Args:
+            url (str): Url of the manga.
+            name (str, optional): Friendly name of the manga. Defaults to the name in the url.
+            interval (float, optional): Seconds between two polls. Defaults to 3600.
+            convert (str, optional): Format to convert the new chapters to, "cbz" or "zip". Defaults to None.
+            one_file (bool, optional): If True, all chapters will be in one file. Defaults to False.
+        """
+        self.url = url
+        self.name = name
+        self.interval = interval
+        self.convert = convert
+        self.one_file = one_file
+        # The manga, kept between polls with its session and data
+        self.manga = None
+        # Time of the next poll, from time.monotonic()
+        self.next_poll = 0
+        # Time and result of the last poll
+        self.last_poll = None
+        self.last_result = None
+
+    def to_dict(self) -> dict:
+        """
+        This function will convert the series to a dict, as saved in "watch.json".
+        """
+        return {
+            "url": self.url,
+            "name": self.name,
+            "interval": self.interval,
+            "convert": self.convert,
+            "one_file": self.one_file
+        }
+
+
+class Watcher:
+    """
+    Poll followed manga, each on its own schedule, and download and convert
+    their new chapters.
+
+    The Mangaread of each manga is kept between polls, so its connections,
+    its data and the chapters of its manga page are not loaded again.
+    The list of manga is saved in "<output_dir>/watch.json", and is
+    controlled through a Unix socket, see 'send_command'.
+    """
+    def __init__(self, output_dir: str = None, nb_threads: int = 15, jitter: float = 0.1, probe: bool = False,
+                 debug: bool = False) -> None:
+        """
+        Args:
+            output_dir (str, optional): Output directory. Defaults to "mangaread-dl" in the current directory.
+            nb_threads (int, optional): Number of threads of each manga. Defaults to 15.
+            jitter (float, optional): Random part of the interval between two polls,
+            0.1 is +/- 10%. Defaults to 0.1.
+            probe (bool, optional): Probe the size of the images before downloading them. Defaults to False.
+            debug (bool, optional): Debug mode. Defaults to False.
+        """
+        self.output_path = output_dir if output_dir != None else os.path.join(os.getcwd(), "mangaread-dl")
+        self.nb_threads = nb_threads
+        self.jitter = jitter
+        self.probe = probe
+        self.debug = debug
+        # Followed manga, by url
+        self.series = {}
+        # Url of the manga being polled
+        self.polling = None
+        # Lock protecting the series
+        self.lock = threading.Lock()
+        # Set to poll again before the next scheduled poll, or to stop
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        # Saved list of manga
+        self.watch_path = os.path.join(self.output_path, "watch.json")
+        # Control socket
+        self.socket_path = os.path.join(self.output_path, "watch.sock")
+        self.server = None
+
+    def _schedule(self, series: Series, delay: float) -> None:
+        """
+        This function will schedule the next poll of a series, with jitter.
+
+        Args:
+            series (Series): The series.
+            delay (float): Seconds before the poll, without jitter.
+        """
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        series.next_poll = time.monotonic() + delay
+
+    def _load(self) -> None:
+        """
+        This function will load the saved list of manga.
+        """
+        if not os.path.exists(self.watch_path):
+            return
+        with open(self.watch_path, "r") as f:
+            data = json.loads(f.read())
+        for infos in data:
+            series = Series(**infos)
+            series.interval = max(series.interval, MIN_INTERVAL)
+            # Spread the first polls over the first minute
+            series.next_poll = time.monotonic() + random.uniform(0, min(60, series.interval * self.jitter))
+            self.series[series.url] = series
+
+    def _save(self) -> None:
+        """
+        This function will save the list of manga, lock must be held.
+        """
+        data = [series.to_dict() for series in self.series.values()]
+        # Write then rename, so the file is never half written
+        with open(self.watch_path + ".tmp", "w") as f:
+            f.write(json.dumps(data, indent=4))
+        os.replace(self.watch_path + ".tmp", self.watch_path)
+
+    def add(self, url: str, name: str = None, interval: float = 3600, convert: str = None,
+            one_file: bool = False) -> dict:
+        """
+        This function will follow a manga, polled as soon as possible.
+
+        Raises:
+            ValueError: If the format is unknown, or the interval below MIN_INTERVAL.
+
+        Returns:
+            dict: The series, as saved in "watch.json".
+        """
+        if interval < MIN_INTERVAL:
+            raise ValueError("The interval must be at least {} seconds".format(MIN_INTERVAL))
+        if convert not in (None, "cbz", "zip"):
+            raise ValueError("Unknown format: {}, available formats: cbz, zip".format(convert))
+        series = Series(url, name, interval, convert, one_file)
+        with self.lock:
+            # Keep the warm manga if already followed
+            old = self.series.get(url)
+            if old != None and old.name == name:
+                series.manga = old.manga
+            self.series[url] = series
+            self._save()
+        self.wake.set()
+        return series.to_dict()
+
+    def remove(self, url: str) -> bool:
+        """
+        This function will stop following a manga. The downloaded files are kept.
+
+        Returns:
+            bool: True if the manga was followed.
+        """
+        with self.lock:
+            series = self.series.pop(url, None)
+            if series != None:
+                self._save()
+        return series != None
+
+    def status(self) -> dict:
+        """
+        This function will get the state of the followed manga.
+
+        Returns:
+            dict: {"polling": url or None, "series": [...]}
+        """
+        now = time.monotonic()
+        with self.lock:
+            series_list = list(self.series.values())
+            polling = self.polling
+        status = []
+        for series in series_list:
+            infos = series.to_dict()
+            infos["next_poll_in"] = max(0, round(series.next_poll - now))
+            infos["last_poll"] = series.last_poll
+            infos["last_result"] = series.last_result
+            if series.manga != None:
+                infos["chapters_downloaded"] = series.manga.currentChapterDownloaded
+                infos["chapters_scraped"] = series.manga.currentChapterScrapped
+            status.append(infos)
+        return {"polling": polling, "series": status}
+
+    def _poll(self, series: Series) -> None:
+        """
+        This function will download and convert the new chapters of a series.
+
+        Args:
+            series (Series): The series.
+        """
+        if series.manga == None:
+            series.manga = Mangaread(
+                series.url,
+                name=series.name,
+                nb_threads=self.nb_threads,
+                debug=self.debug,
+                probe=self.probe,
+                output_dir=self.output_path
+            )
+        manga = series.manga
+        print("> Polling '{}'".format(manga.manga_name))
+        old_chapter_downloaded = manga.currentChapterDownloaded
+        try:
+            success = manga.sync()
+            nb_new = manga.currentChapterDownloaded - old_chapter_downloaded
+            # The found chapters are downloaded even if scraping failed
+            if nb_new > 0 and series.convert != None:
+                manga.package(series.convert, series.one_file, first_chapter=old_chapter_downloaded)
+            series.last_result = "{} new chapters".format(nb_new)
+            if not success:
+                series.last_result += ", failed"
+        except Exception as e:
+            series.last_result = "error: {}".format(e)
+            print("> An error occured while polling '{}': {}".format(manga.manga_name, e))
+            if self.debug:
+                traceback.print_exc()
+        series.last_poll = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def _serve(self) -> None:
+        """
+        This function will start the control socket, in a thread.
+
+        Raises:
+            RuntimeError: If Unix sockets are not available, or a watcher is already running.
+        """
+        _check_unix_sockets()
+        watcher = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                # One JSON command per line, one JSON answer per line
+                for line in self.rfile:
+                    try:
+                        answer = {"ok": True, "result": watcher.handle_command(json.loads(line))}
+                    except Exception as e:
+                        answer = {"ok": False, "error": str(e)}
+                    self.wfile.write((json.dumps(answer) + "\n").encode())
+
+        # A socket left by a stopped watcher
+        if os.path.exists(self.socket_path):
+            try:
+                send_command(self.socket_path, {"command": "status"})
+            except OSError:
+                os.remove(self.socket_path)
+            else:
+                raise RuntimeError("A watcher is already running on {}".format(self.socket_path))
+        self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handle_command(self, command: dict) -> any:
+        """
+        This function will run a command received on the control socket.
+
+        Args:
+            command (dict): {"command": "add", "url", ...}, {"command": "remove", "url"},
+            {"command": "status"} or {"command": "stop"}.
+
+        Returns:
+            any: Result of the command.
+        """
+        name = command.get("command")
+        if name == "add":
+            return self.add(
+                command["url"],
+                name=command.get("name"),
+                interval=command.get("interval", 3600),
+                convert=command.get("convert"),
+                one_file=command.get("one_file", False)
+            )
+        if name == "remove":
+            return self.remove(command["url"])
+        if name == "status":
+            return self.status()
+        if name == "stop":
+            self.stop()
+            return True
+        raise ValueError("Unknown command: {}".format(name))
+
+    def stop(self) -> None:
+        """
+        This function will stop the watcher, after the current poll.
+        """
+        self.stopped.set()
+        self.wake.set()
+
+    def run(self) -> None:
+        """
+        This function will poll the followed manga until stopped.
+
+        Raises:
+            RuntimeError: If the control socket can't be started.
+        """
+        os.makedirs(self.output_path, exist_ok=True)
+        self._load()
+        self._serve()
+        print("> Watching {} manga, control socket: {}".format(len(self.series), self.socket_path))
+        try:
+            while not self.stopped.is_set():
+                # Next series to poll
+                with self.lock:
+                    series = min(self.series.values(), key=lambda series: series.next_poll, default=None)
+                delay = 60 if series == None else series.next_poll - time.monotonic()
+                if delay > 0:
+                    # Woken up by 'add' or 'stop'
+                    self.wake.wait(delay)
+                    self.wake.clear()
+                    continue
+                with self.lock:
+                    # Removed while waiting
+                    if self.series.get(series.url) is not series:
+                        continue
+                    self.polling = series.url
+                self._poll(series)
+                with self.lock:
+                    self.polling = None
+                self._schedule(series, series.interval)
+        except KeyboardInterrupt:
+            print("\n> Stopping...")
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            print("> Watcher stopped")
+
+
+def _check_unix_sockets() -> None:
+    """
+    This function will check that Unix sockets are available, e.g. not on
+    Windows, the control socket of the watcher is one.
+
+    Raises:
+        RuntimeError: If Unix sockets are not available.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("The watch mode needs Unix sockets, they are not available on this system")
+
+
+def send_command(socket_path: str, command: dict, timeout: float = 10) -> any:
+    """
+    This function will send a command to a running watcher.
+
+    Args:
+        socket_path (str): Path of the control socket.
+        command (dict): The command, see 'Watcher.handle_command'.
+        timeout (float, optional): Seconds to wait for the answer. Defaults to 10.
+
+    Raises:
+        OSError: If no watcher is running.
+        RuntimeError: If the command failed, or Unix sockets are not available.
+
+    Returns:
+        any: Result of the command.
+    """
+    _check_unix_sockets()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall((json.dumps(command) + "\n").encode())
+        with client.makefile("r") as f:
+            answer = json.loads(f.readline())
+    if not answer["ok"]:
+        raise RuntimeError(answer["error"])
+    return answer["result"]
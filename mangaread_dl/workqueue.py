@@ -0,0 +1,429 @@
+"""
+Work queue shared by a coordinator and workers, and the worker.
+"""
+
+import abc
+import contextlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from .chapter import parse_chapter
+from .utils import make_session
+
+
+class WorkQueue(abc.ABC):
+    """
+    Work queue shared by a coordinator and workers, possibly on several machines.
+
+    A task is leased by one worker at a time. The lease expires after the
+    visibility timeout unless the worker sends a heartbeat, the task is then
+    given to another worker.
+
+    This class is the interface, subclass it and implement every method to
+    use a real broker.
+    """
+    @abc.abstractmethod
+    def publish(self, series: str, kind: str, tasks: list) -> None:
+        """
+        This function will add tasks to the queue.
+
+        Args:
+            series (str): Name of the manga the tasks belong to.
+            kind (str): Kind of the tasks: "chapter" or "image".
+            tasks (list): Tasks - (position, payload, priority).
+            Tasks with a higher priority are leased first.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self, series: str, kind: str) -> None:
+        """
+        This function will remove the tasks of a series.
+
+        Args:
+            series (str): Name of the manga.
+            kind (str): Kind of the tasks.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def lease(self, worker_id: str, visibility_timeout: float) -> dict:
+        """
+        This function will lease the next task.
+
+        Args:
+            worker_id (str): Id of the worker.
+            visibility_timeout (float): Seconds before the lease expires.
+
+        Returns:
+            dict: The task - {"id", "kind", "payload"}. None if no task is available.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def heartbeat(self, task_ids: list, worker_id: str, visibility_timeout: float) -> None:
+        """
+        This function will extend the lease of tasks.
+
+        Args:
+            task_ids (list): Ids of the tasks.
+            worker_id (str): Id of the worker holding the tasks.
+            visibility_timeout (float): Seconds before the lease expires.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def complete(self, task_id: int, worker_id: str, result: any) -> None:
+        """
+        This function will mark a task as done, if still leased by the worker.
+
+        Args:
+            task_id (int): Id of the task.
+            worker_id (str): Id of the worker holding the task.
+            result (any): Result of the task, JSON serializable.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        """
+        This function will give back a task which failed, if still leased by
+        the worker, to be retried after a delay growing with its attempts.
+
+        Args:
+            task_id (int): Id of the task.
+            worker_id (str): Id of the worker holding the task.
+            error (str): The error.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def counts(self, series: str, kind: str) -> dict:
+        """
+        This function will count the tasks of a series by status.
+
+        Args:
+            series (str): Name of the manga.
+            kind (str): Kind of the tasks.
+
+        Returns:
+            dict: Number of tasks by status: "pending", "leased", "done", "failed".
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def results(self, series: str, kind: str) -> list:
+        """
+        This function will get the results of the done tasks.
+
+        Args:
+            series (str): Name of the manga.
+            kind (str): Kind of the tasks.
+
+        Returns:
+            list: Results - (position, result).
+        """
+        raise NotImplementedError
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Work queue stored in a SQLite file, e.g. on a shared storage.
+    """
+    def __init__(self, path: str, max_attempts: int = 5, retry_delay: float = 5,
+                 max_retry_delay: float = 60) -> None:
+        """
+        Args:
+            path (str): Path of the SQLite file.
+            max_attempts (int, optional): Number of leases of a task before
+            it is marked as failed. Defaults to 5.
+            retry_delay (float, optional): Seconds before a failed task is leased
+            again, doubled at each attempt. Defaults to 5.
+            max_retry_delay (float, optional): Maximum seconds before a failed
+            task is leased again. Defaults to 60.
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        with self._connect() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    series TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_until REAL NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+            con.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, priority)")
+
+    def _connect(self) -> contextlib.closing:
+        """
+        This function will open a connection, one per call as connections
+        can't be shared between threads.
+        """
+        con = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        return contextlib.closing(con)
+
+    def _expire(self, con: sqlite3.Connection) -> None:
+        """
+        This function will mark as failed the expired tasks with no attempt left.
+        """
+        con.execute(
+            "UPDATE tasks SET status = 'failed', error = 'lease expired'"
+            " WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+            (time.time(), self.max_attempts)
+        )
+
+    def publish(self, series: str, kind: str, tasks: list) -> None:
+        with self._connect() as con:
+            con.execute("BEGIN IMMEDIATE")
+            con.executemany(
+                "INSERT INTO tasks (series, kind, position, payload, priority) VALUES (?, ?, ?, ?, ?)",
+                [(series, kind, position, json.dumps(payload), priority) for position, payload, priority in tasks]
+            )
+            con.execute("COMMIT")
+
+    def clear(self, series: str, kind: str) -> None:
+        with self._connect() as con:
+            con.execute("DELETE FROM tasks WHERE series = ? AND kind = ?", (series, kind))
+
+    def lease(self, worker_id: str, visibility_timeout: float) -> dict:
+        now = time.time()
+        with self._connect() as con:
+            # Lock the database, so two workers can't lease the same task
+            con.execute("BEGIN IMMEDIATE")
+            self._expire(con)
+            # A failed task is pending until 'lease_until', the end of its retry delay
+            row = con.execute(
+                "SELECT id, kind, payload FROM tasks"
+                " WHERE (status = 'pending' AND lease_until <= ?) OR (status = 'leased' AND lease_until < ?)"
+                " ORDER BY priority DESC, id LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row is not None:
+                con.execute(
+                    "UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1"
+                    " WHERE id = ?",
+                    (worker_id, now + visibility_timeout, row[0])
+                )
+            con.execute("COMMIT")
+        if row is None:
+            return None
+        return {"id": row[0], "kind": row[1], "payload": json.loads(row[2])}
+
+    def heartbeat(self, task_ids: list, worker_id: str, visibility_timeout: float) -> None:
+        with self._connect() as con:
+            con.executemany(
+                "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                [(time.time() + visibility_timeout, task_id, worker_id) for task_id in task_ids]
+            )
+
+    def complete(self, task_id: int, worker_id: str, result: any) -> None:
+        with self._connect() as con:
+            con.execute(
+                "UPDATE tasks SET status = 'done', result = ?, error = NULL"
+                " WHERE id = ? AND worker = ? AND status = 'leased'",
+                (json.dumps(result), task_id, worker_id)
+            )
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        with self._connect() as con:
+            # Retry delay: retry_delay * 2 ** (attempts - 1), up to max_retry_delay
+            con.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+                " lease_until = ? + MIN(?, ? * (1 << MIN(MAX(attempts - 1, 0), 30))), error = ?"
+                " WHERE id = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, time.time(), self.max_retry_delay, self.retry_delay, error, task_id, worker_id)
+            )
+
+    def counts(self, series: str, kind: str) -> dict:
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        with self._connect() as con:
+            self._expire(con)
+            for status, count in con.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE series = ? AND kind = ? GROUP BY status",
+                (series, kind)
+            ):
+                counts[status] = count
+        return counts
+
+    def results(self, series: str, kind: str) -> list:
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT position, result FROM tasks WHERE series = ? AND kind = ? AND status = 'done'"
+                " ORDER BY position",
+                (series, kind)
+            ).fetchall()
+        return [(position, json.loads(result)) for position, result in rows]
+
+
+class Worker:
+    """
+    Worker leasing tasks from a WorkQueue, run on any number of machines.
+
+    Paths of the images in the tasks are relative to the output directory,
+    so the machines can mount the shared storage anywhere.
+    """
+    def __init__(self, work_queue: WorkQueue, nb_threads: int = 15, visibility_timeout: float = 60,
+                 idle_timeout: float = 60, debug: bool = False, output_dir: str = None) -> None:
+        """
+        Args:
+            work_queue (WorkQueue): The queue to lease tasks from.
+            nb_threads (int, optional): Number of tasks run at once. Defaults to 15.
+            visibility_timeout (float, optional): Seconds before the lease
+            of a task expires without heartbeat. Defaults to 60.
+            idle_timeout (float, optional): Seconds without task before the
+            worker stops. Defaults to 60.
+            debug (bool, optional): Debug mode. Defaults to False.
+            output_dir (str, optional): Output directory, the paths of the images
+            are relative to it. Defaults to "mangaread-dl" in the current directory.
+        """
+        self.work_queue = work_queue
+        self.nb_threads = nb_threads
+        self.visibility_timeout = visibility_timeout
+        self.idle_timeout = idle_timeout
+        self.debug = debug
+        # Id of the worker
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        # Output directory
+        self.output_path = output_dir if output_dir != None else os.path.join(os.getcwd(), "mangaread-dl")
+        # Ids of the tasks being run, for the heartbeat
+        self.leased = set()
+        self.lock = threading.Lock()
+        # Time of the last task leased
+        self.last_task = time.monotonic()
+        # Event used to stop the heartbeat
+        self.stopped = threading.Event()
+        # Session shared by the threads, to reuse connections
+        self.session = make_session(self.nb_threads)
+        # Number of tasks done
+        self.nb_done = 0
+
+    def print_debug(self, *args, **kwargs) -> None:
+        """
+        This function will print the arguments if debug is True.
+        """
+        if self.debug:
+            print("[DEBUG]", *args, **kwargs)
+
+    def _run_task(self, task: dict) -> any:
+        """
+        This function will run a task.
+
+        Args:
+            task (dict): The task - {"id", "kind", "payload"}.
+
+        Returns:
+            any: Result of the task.
+        """
+        payload = task["payload"]
+        # Scrap the images of a chapter
+        if task["kind"] == "chapter":
+            html = self.session.get(payload["url"], timeout=60)
+            html.raise_for_status()
+            return parse_chapter(html.text, payload["position"]).to_dict()
+        # Download an image
+        if task["kind"] == "image":
+            image = self.session.get(payload["url"], timeout=60)
+            image.raise_for_status()
+            path = os.path.join(self.output_path, payload["path"])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file, so an interrupted write doesn't leave
+            # a truncated image, seen as downloaded by the coordinator
+            # Unique per lease, as an expired task may be run by two workers at once
+            part_path = f"{path}.{self.worker_id}.{task['id']}.part"
+            with open(part_path, "wb") as f:
+                f.write(image.content)
+            os.replace(part_path, path)
+            return {"size": len(image.content)}
+        raise ValueError("Unknown task kind: {}".format(task["kind"]))
+
+    def _lease_loop(self) -> None:
+        """
+        This function will lease and run tasks until the worker is idle.
+        """
+        # Seconds to wait after an error of the queue, doubled at each error in a row
+        delay = 1
+        while not self.stopped.is_set():
+            # The queue can fail for a while, e.g. "database is locked" with SQLite
+            try:
+                task = self.work_queue.lease(self.worker_id, self.visibility_timeout)
+            except Exception as e:
+                print("> Lease failed, retrying in {}s: {}".format(delay, e))
+                self.stopped.wait(delay)
+                delay = min(delay * 2, 30)
+                continue
+            delay = 1
+            if task is None:
+                with self.lock:
+                    idle = time.monotonic() - self.last_task
+                if idle > self.idle_timeout:
+                    return
+                time.sleep(1)
+                continue
+            with self.lock:
+                self.last_task = time.monotonic()
+                self.leased.add(task["id"])
+            try:
+                result = self._run_task(task)
+                self.work_queue.complete(task["id"], self.worker_id, result)
+                with self.lock:
+                    self.nb_done += 1
+                self.print_debug(f"Task {task['id']} done: {task['payload']['url']}")
+            except Exception as e:
+                print("> Task {} failed: {}".format(task["id"], e))
+                try:
+                    self.work_queue.fail(task["id"], self.worker_id, str(e))
+                except Exception as e:
+                    # The lease expires, the task is then leased again
+                    print("> Giving back task {} failed: {}".format(task["id"], e))
+            finally:
+                with self.lock:
+                    self.leased.discard(task["id"])
+
+    def _heartbeat_loop(self) -> None:
+        """
+        This function will extend the lease of the tasks being run.
+        """
+        while not self.stopped.wait(self.visibility_timeout / 3):
+            with self.lock:
+                task_ids = list(self.leased)
+            if task_ids:
+                try:
+                    self.work_queue.heartbeat(task_ids, self.worker_id, self.visibility_timeout)
+                except Exception as e:
+                    print("> Heartbeat failed: {}".format(e))
+
+    def run(self) -> None:
+        """
+        This function will run the worker until no task is left for idle_timeout seconds.
+        """
+        print("> Worker {} started".format(self.worker_id))
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat.start()
+        threads = [threading.Thread(target=self._lease_loop, daemon=True) for _ in range(self.nb_threads)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(1)
+        except KeyboardInterrupt:
+            # Tasks being run will be leased again once expired
+            print("\n> Stopping...")
+        finally:
+            self.stopped.set()
+            print("> Worker stopped, {} tasks done".format(self.nb_done))